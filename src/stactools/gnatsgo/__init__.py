@@ -1,12 +1,19 @@
 import stactools.core
 
-from stactools.gnatsgo.stac import create_collection, create_item
-
 __all__ = ['create_collection', 'create_item']
 
 stactools.core.use_fsspec()
 
 
+def __getattr__(name):
+    # import the stac module (and rasterio, pyarrow, etc.) on first use, so
+    # the command line utility doesn't pay for it on every invocation
+    if name in __all__:
+        from stactools.gnatsgo import stac
+        return getattr(stac, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 def register_plugin(registry):
     from stactools.gnatsgo import commands
     registry.register_subcommand(commands.create_gnatsgo_command)
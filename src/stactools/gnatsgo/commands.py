@@ -1,15 +1,200 @@
+import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from typing import List
 
 import click
 
-from stactools.gnatsgo import stac
-from stactools.gnatsgo.constants import DEFAULT_TILE_SIZE
-from stactools.gnatsgo.utils import create_derived_rasters, tile, to_parquet
+from stactools.gnatsgo.constants import (DEFAULT_TILE_SIZE, GDAL_ENV,
+                                         GDB_ENGINES, ITEM_GDAL_ENV)
 
 logger = logging.getLogger(__name__)
 
 
+def _gdal_env(**overrides):
+    """GDAL configuration shared by all commands that open rasters."""
+    import rasterio
+    return rasterio.Env(**{**GDAL_ENV, **overrides})
+
+
+@click.command("to-parquet",
+               help="convert tables in incoming GDB files to parquet")
+@click.argument("in_dir")
+@click.argument("out_dir")
+@click.argument("tables", nargs=-1)
+@click.option("-e",
+              "--engine",
+              type=click.Choice(GDB_ENGINES),
+              default="pyogrio",
+              help="library used to read the GDB tables")
+@click.option("-j",
+              "--jobs",
+              default=1,
+              help="number of tables to convert in parallel")
+def to_parquet_command(in_dir: str, out_dir: str, tables: List[str],
+                       engine: str, jobs: int):
+    """convert gNATSGO and gSSURGO tables from incoming GDB files to parquet
+
+    Args:
+        in_dir (str): directory containing CONUS and by-state GDBs
+        out_dir (str): path to output dir
+        tables (List[str]): optional list of tables to convert
+        engine (str): library used to read the GDB tables
+        jobs (int): number of tables to convert in parallel
+    """
+    from stactools.gnatsgo.utils import to_parquet
+    with _gdal_env():
+        to_parquet(in_dir, out_dir, tables, engine=engine, jobs=jobs)
+
+
+@click.command("tile", help="convert state/territory tifs to tiled")
+@click.argument("in_dir")
+@click.argument("out_dir")
+@click.option("-s", "--size", default=DEFAULT_TILE_SIZE)
+@click.option("-w",
+              "--workers",
+              default=1,
+              help="number of tiles to write in parallel")
+def tile_command(in_dir, out_dir, size, workers):
+    """Tiles the input files to a grid.
+    The source gNATSGO data contain state-based 10m GeoTIFFS, so we tile.
+
+    Args:
+        in_dir (str): directory containing state/territory mukey rasters
+        out_dir (str): output directory
+        workers (int): number of tiles to write in parallel
+    """
+    from stactools.gnatsgo.utils import tile
+    with _gdal_env():
+        tile(in_dir, out_dir, size, workers=workers)
+
+
+@click.command(
+    "create-derived-rasters",
+    help="create raster layers using the value-ad table provided by ssurgo")
+@click.argument("parquet_table")
+@click.argument("mukey_files", nargs=-1)
+@click.option("-w",
+              "--workers",
+              default=1,
+              help="number of mukey rasters to process in parallel")
+def derived_rasters_command(parquet_table: str, mukey_files: List[str],
+                            workers: int):
+    """gSSURGO provides a value-add table with commonly calculated values
+    for each map unit. Use this table and the mukey rasters to create COGs.
+
+    Args:
+        parquet_table (str): path to the valu1 parquet table
+        mukey_files (list): list of mukey rasters to process
+        workers (int): number of mukey rasters to process in parallel
+    """
+    from stactools.gnatsgo.utils import create_derived_rasters
+    with _gdal_env():
+        create_derived_rasters(parquet_table, mukey_files, workers=workers)
+
+
+@click.command(
+    "create-collection",
+    short_help="Creates a STAC collection",
+)
+@click.argument("destination")
+@click.argument("parquet_dir")
+def create_collection_command(destination: str, parquet_dir: str):
+    """Creates a STAC Collection
+
+    Args:
+        parquet_dir (str): A path to directory containing the parquet tables
+        destination (str): An HREF for the Collection JSON
+    """
+    from stactools.gnatsgo import stac
+    collection = stac.create_collection(parquet_dir)
+    collection.set_self_href(destination)
+    collection.save_object()
+    return None
+
+
+@click.command("create-item", short_help="Create a STAC item")
+@click.argument("destination")
+@click.argument("sources", nargs=-1)
+def create_item_command(destination: str, sources: List[str]):
+    """Creates a STAC Item
+
+    Args:
+        sources (List[str]): HREFs of the Assets associated with the Item
+        destination (str): An HREF for the STAC Collection
+    """
+    from stactools.gnatsgo import stac
+    with _gdal_env(**ITEM_GDAL_ENV):
+        item = stac.create_item(sources)
+
+    item.save_object(dest_href=destination)
+
+    return None
+
+
+def _create_item_entry(entry, validate=False):
+    """Create and save the Item described by one create-items manifest entry.
+    """
+    from stactools.gnatsgo import stac
+    with _gdal_env(**ITEM_GDAL_ENV):
+        item = stac.create_item(entry["sources"], validate=validate)
+    item.save_object(dest_href=entry["destination"])
+    return entry["destination"]
+
+
+@click.command("create-items",
+               short_help="Create STAC items listed in a manifest")
+@click.argument("manifest")
+@click.option("-w",
+              "--workers",
+              default=4,
+              help="number of items to create concurrently")
+@click.option("--validate/--no-validate",
+              default=False,
+              help="validate each item against the STAC schemas")
+def create_items_command(manifest: str, workers: int, validate: bool):
+    """Creates many STAC Items in a single process
+
+    Args:
+        manifest (str): path to a JSON lines file with one
+            {"destination": ..., "sources": [...]} object per Item
+        workers (int): number of Items to create concurrently
+        validate (bool): validate each Item against the STAC schemas
+    """
+    with open(manifest) as f:
+        entries = [json.loads(line) for line in f if line.strip()]
+
+    # item creation is dominated by reading raster headers, so threads
+    # overlap the I/O
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for destination in executor.map(
+                partial(_create_item_entry, validate=validate), entries):
+            logger.info("created %s", destination)
+
+
+COMMANDS = [
+    to_parquet_command,
+    tile_command,
+    derived_rasters_command,
+    create_collection_command,
+    create_item_command,
+    create_items_command,
+]
+
+
+def _load_config(ctx, param, value):
+    """Use a JSON config file as the defaults for the subcommands' options.
+
+    The file maps command names to option values, e.g.
+    {"to-parquet": {"engine": "fiona", "jobs": 4}, "tile": {"size": 81920}}.
+    Options given on the command line override the file.
+    """
+    if value is not None:
+        with open(value) as f:
+            ctx.default_map = json.load(f)
+
+
 def create_gnatsgo_command(cli):
     """Creates the stactools-gnatsgo command line utility."""
 
@@ -17,86 +202,17 @@ def create_gnatsgo_command(cli):
         "gnatsgo",
         short_help=("Commands for working with stactools-gnatsgo"),
     )
+    @click.option("-c",
+                  "--config",
+                  type=click.Path(exists=True, dir_okay=False),
+                  callback=_load_config,
+                  is_eager=True,
+                  expose_value=False,
+                  help="JSON file with default parameters for each command")
     def gnatsgo():
         pass
 
-    @gnatsgo.command("to-parquet",
-                     help="convert tables in incoming GDB files to parquet")
-    @click.argument("in_dir")
-    @click.argument("out_dir")
-    @click.argument("tables", nargs=-1)
-    def to_parquet_command(in_dir: str, out_dir: str, tables: List[str]):
-        """convert gNATSGO and gSSURGO tables from incoming GDB files to parquet
-
-        Args:
-            in_dir (str): directory containing CONUS and by-state GDBs
-            out_dir (str): path to output dir
-            tables (List[str]): optional list of tables to convert
-        """
-        to_parquet(in_dir, out_dir, tables)
-
-    @gnatsgo.command("tile", help="convert state/territory tifs to tiled")
-    @click.argument("in_dir")
-    @click.argument("out_dir")
-    @click.option("-s", "--size", default=DEFAULT_TILE_SIZE)
-    def tile_command(in_dir, out_dir, size):
-        """Tiles the input files to a grid.
-        The source gNATSGO data contain state-based 10m GeoTIFFS, so we tile.
-
-        Args:
-            in_dir (str): directory containing state/territory mukey rasters
-            out_dir (str): output directory
-        """
-        tile(in_dir, out_dir, size)
-
-    @gnatsgo.command(
-        "create-derived-rasters",
-        help="create raster layers using the value-ad table provided by ssurgo"
-    )
-    @click.argument("parquet_table")
-    @click.argument("mukey_files", nargs=-1)
-    def derived_rasters_command(parquet_table: str, mukey_files: List[str]):
-        """gSSURGO provides a value-add table with commonly calculated values
-        for each map unit. Use this table and the mukey rasters to create COGs.
-
-        Args:
-            parquet_table (str): path to the valu1 parquet table
-            mukey_files (list): list of mukey rasters to process
-        """
-        create_derived_rasters(parquet_table, mukey_files)
-
-    @gnatsgo.command(
-        "create-collection",
-        short_help="Creates a STAC collection",
-    )
-    @click.argument("destination")
-    @click.argument("parquet_dir")
-    def create_collection_command(destination: str, parquet_dir: str):
-        """Creates a STAC Collection
-
-        Args:
-            parquet_dir (str): A path to directory containing the parquet tables
-            destination (str): An HREF for the Collection JSON
-        """
-        collection = stac.create_collection(parquet_dir)
-        collection.set_self_href(destination)
-        collection.save_object()
-        return None
-
-    @gnatsgo.command("create-item", short_help="Create a STAC item")
-    @click.argument("destination")
-    @click.argument("sources", nargs=-1)
-    def create_item_command(destination: str, sources: List[str]):
-        """Creates a STAC Item
-
-        Args:
-            sources (List[str]): HREFs of the Assets associated with the Item
-            destination (str): An HREF for the STAC Collection
-        """
-        item = stac.create_item(sources)
-
-        item.save_object(dest_href=destination)
-
-        return None
+    for command in COMMANDS:
+        gnatsgo.add_command(command)
 
     return gnatsgo
@@ -0,0 +1,87 @@
+import importlib
+from types import MappingProxyType
+from typing import Final, Tuple
+
+# tile size in CRS units (meters): 2**14 of the 10m pixels per side
+DEFAULT_TILE_SIZE: Final[int] = 2**14 * 10
+
+# libraries that can be used to read tables from the GDBs
+GDB_ENGINES: Final[Tuple[str, ...]] = ('pyogrio', 'fiona')
+
+# rows read from a GDB table at a time when converting it to parquet
+GDB_READ_CHUNK_SIZE: Final[int] = 1000000
+
+# number of regional GDBs of a partitioned table converted concurrently
+GDB_WORKERS: Final[int] = 4
+
+# the strings the GDBs use for true and false in their boolean columns
+BOOLEAN_TRUE: Final[Tuple[str, ...]] = ('Yes', '1  ')
+BOOLEAN_FALSE: Final[Tuple[str, ...]] = ('No ', 'No', '0  ')
+
+# number of columns each derived raster tile writes concurrently; each holds
+# its own tile-sized output buffers
+COLUMN_WORKERS: Final[int] = 2
+
+# GDAL configuration used by the command line utility; avoids directory
+# listings and redundant requests when opening remote COGs
+GDAL_ENV = MappingProxyType({
+    'GDAL_DISABLE_READDIR_ON_OPEN': 'EMPTY_DIR',
+    'CPL_VSIL_CURL_ALLOWED_EXTENSIONS': '.tif,.tiff',
+    'GDAL_HTTP_MULTIPLEX': 'YES',
+    'GDAL_CACHEMAX': 1024,
+    'GDAL_INGESTED_BYTES_AT_OPEN': 32768,
+})
+
+# creating items only reads COG headers, so fetch a larger first block (the
+# IFDs of all the overviews) in one request, merge adjacent range reads, and
+# skip the HEAD request for the file size; the cache size is per open file,
+# and only needs to hold the headers
+ITEM_GDAL_ENV = MappingProxyType({
+    'GDAL_INGESTED_BYTES_AT_OPEN': 65536,
+    'VSI_CACHE': 'TRUE',
+    'VSI_CACHE_SIZE': 16777216,
+    'GDAL_HTTP_MERGE_CONSECUTIVE_RANGES': 'YES',
+    'GDAL_HTTP_VERSION': '2TLS',
+    'CPL_VSIL_CURL_USE_HEAD': 'NO',
+})
+
+# pixels per side of the chunks read when checking a tile for valid data
+PROBE_CHUNK_SIZE: Final[int] = 2048
+
+# options for pyarrow.parquet.ParquetWriter when writing the tables; zstd
+# gives smaller files than snappy at similar read speed, and the statistics
+# let readers skip row groups when filtering
+PARQUET_WRITE_OPTIONS = MappingProxyType({
+    'compression': 'zstd',
+    'compression_level': 3,
+    'use_dictionary': True,
+    'write_statistics': True,
+    'data_page_size': 1 << 20,
+})
+
+PARQUET_ROW_GROUP_SIZE: Final[int] = 200000
+
+# larger or more expensive constants live in submodules, which are imported
+# on first access (PEP 562) so callers only pay for what they use
+_LAZY = {
+    'GNATSGO_EXTENTS': '_regions',
+    'PRODUCT': '_regions',
+    'STATE_INDEX': '_regions',
+    'GNATSGO_DATETIME': '_stac',
+    'GNATSGO_DESCRIPTION': '_stac',
+    'GNATSGO_LINKS': '_stac',
+    'GNATSGO_PROVIDERS': '_stac',
+    'TABLES': '_tables',
+    'TableSpec': '_tables',
+    'VALU1_DESCRIPTIONS': '_valu1',
+}
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        module = importlib.import_module(f"{__name__}.{_LAZY[name]}")
+        # keep the value as a module global, so later lookups don't come
+        # through here
+        value = globals()[name] = getattr(module, name)
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,50 @@
+"""Regions covered by gNATSGO/gSSURGO and the states/territories in each."""
+from types import MappingProxyType
+from typing import Final
+
+import numpy as np
+
+# [minx, miny, maxx, maxy] per region, as a read-only array so bbox tests can
+# be vectorized; use .tolist() where plain lists are needed (e.g. pystac)
+GNATSGO_EXTENTS: Final[np.ndarray] = np.array([
+    [-170.8513, -14.3799, -169.4152, -14.1432],  # AS
+    [138.0315, 5.1160, 163.1902, 10.2773],  # FM
+    [144.6126, 13.2327, 144.9658, 13.6572],  # GU
+    [-159.7909, 18.8994, -154.7815, 22.2464],  # HI
+    [170.9690, 6.0723, 171.9169, 8.71933],  # MH
+    [145.0127, 14.1086, 145.9242, 18.8172],  # MP
+    [130.8048, 2.9268, 134.9834, 8.0947],  # PW
+    [157.3678, 49.0546, -117.2864, 71.4567],  # AK
+    [-67.9506, 17.0140, -64.3973, 19.3206],  # PRUSVI
+    [-127.8881, 22.8782, -65.2748, 51.6039],  # CONUS
+])
+GNATSGO_EXTENTS.setflags(write=False)
+
+# gNATSGO is only provided in states/territories where gSSURGO is gappy.
+# Like the other mappings here, PRODUCT is read-only, so the values derived
+# from it (e.g. STATE_INDEX) can't go stale
+PRODUCT = MappingProxyType({
+    'gNATSGO':
+    MappingProxyType({
+        'CONUS': ('AR', 'AZ', 'CA', 'CO', 'FL', 'GA', 'ID', 'KY', 'MI', 'MN',
+                  'MS', 'MT', 'ND', 'NH', 'NM', 'NV', 'NY', 'OK', 'OR', 'TN',
+                  'TX', 'UT', 'VA', 'VT', 'WA', 'WY'),
+        'NON_CONUS': ('AK', 'PRUSVI'),
+    }),
+    'gSSURGO':
+    MappingProxyType({
+        'CONUS': ('AL', 'CT', 'DC', 'DE', 'IA', 'IL', 'IN', 'KS', 'LA', 'MA',
+                  'MD', 'ME', 'MO', 'NC', 'NE', 'NJ', 'OH', 'PA', 'RI', 'SC',
+                  'SD', 'WI', 'WV'),
+        'NON_CONUS': ('AS', 'FM', 'GU', 'HI', 'MH', 'MP', 'PW'),
+    }),
+})
+
+# state/territory -> (product, region) for every state in PRODUCT, in the
+# same order
+STATE_INDEX = MappingProxyType({
+    state: (product, region)
+    for product, regions in PRODUCT.items()
+    for region, states in regions.items()
+    for state in states
+})
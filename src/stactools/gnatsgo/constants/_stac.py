@@ -0,0 +1,29 @@
+"""Metadata used when creating the STAC Collection and Items."""
+import datetime
+import pkgutil
+
+from pystac import Link, Provider, ProviderRole
+
+GNATSGO_DESCRIPTION = pkgutil.get_data(  # type: ignore
+    __package__, 'description.md').decode('utf-8')
+
+GNATSGO_PROVIDERS = [
+    Provider(
+        "United States Department of Agriculture, Natural Resources Conservation Service",  # noqa
+        roles=[
+            ProviderRole.LICENSOR, ProviderRole.PRODUCER,
+            ProviderRole.PROCESSOR, ProviderRole.HOST
+        ],
+        url=("https://www.nrcs.usda.gov/")),
+]
+
+GNATSGO_LINKS = [
+    Link(
+        "handbook",
+        "https://www.nrcs.usda.gov/wps/PA_NRCSConsumption/download?cid=nrcs142p2_051847&ext=pdf",
+        "application/pdf",
+        "gSSURGO User Guide",
+        extra_fields={"description": "Also includes data usage information"}),
+]
+
+GNATSGO_DATETIME = datetime.datetime(2020, 7, 1, tzinfo=datetime.timezone.utc)
@@ -0,0 +1,102 @@
+"""The gNATSGO/gSSURGO tables converted to parquet, and how to convert them.
+
+The astype values are pandas/numpy dtype objects rather than strings, so
+pandas doesn't have to resolve them for every table it converts.
+"""
+from types import MappingProxyType
+from typing import Any, Mapping, NamedTuple, Tuple
+
+import numpy as np
+from pandas import CategoricalDtype
+
+
+class TableSpec(NamedTuple):
+    """How a gNATSGO/gSSURGO table is converted to parquet."""
+    name: str
+    # partition the output by state, rather than using the CONUS gdb
+    partition: bool = False
+    # read the table from gSSURGO only
+    ssurgo_only: bool = False
+    # column types that override the ones inferred from the gdb
+    astype: Mapping[str, Any] = MappingProxyType({})
+    boolean: Tuple[str, ...] = ()
+
+
+_CATEGORY = CategoricalDtype()
+_MUKEY_INT = MappingProxyType({'mukey': np.dtype('int64')})
+
+
+def _cat(*columns):
+    """astype mapping that makes each of the columns categorical."""
+    return MappingProxyType({column: _CATEGORY for column in columns})
+
+
+# mappings used by several tables are shared
+_PLANT_CAT = _cat('plantsym', 'plantsciname', 'plantcomname')
+_TEXT_CAT = _cat('textcat', 'textsubcat')
+
+TABLES = MappingProxyType({
+    spec.name: spec
+    for spec in [
+        TableSpec('chaashto'),
+        TableSpec('chconsistence'),
+        TableSpec('chdesgnsuffix'),
+        TableSpec('chfrags'),
+        TableSpec('chorizon', partition=True, astype=_cat('hzname')),
+        TableSpec('chpores'),
+        TableSpec('chstruct'),
+        TableSpec('chstructgrp'),
+        TableSpec('chtext', astype=_TEXT_CAT),
+        TableSpec('chtexture'),
+        TableSpec('chtexturegrp', astype=_cat('texture', 'texdesc')),
+        TableSpec('chtexturemod'),
+        TableSpec('chunified'),
+        TableSpec('cocanopycover'),
+        TableSpec('cocropyld'),
+        TableSpec('codiagfeatures'),
+        TableSpec('coecoclass', astype=_cat('ecoclasstypename',
+                                            'ecoclassref')),
+        TableSpec('coeplants', astype=_PLANT_CAT),
+        TableSpec('coerosionacc'),
+        TableSpec('coforprod'),
+        TableSpec('coforprodo'),
+        TableSpec('cogeomordesc',
+                  astype=_cat('geomftname', 'geomfname', 'geomfmod')),
+        TableSpec('cohydriccriteria'),
+        TableSpec('cointerp',
+                  partition=True,
+                  astype=_cat('mrulename', 'rulename', 'interphrc')),
+        TableSpec('comonth', partition=True),
+        TableSpec('component', boolean=('majcompflag', ), astype=_MUKEY_INT),
+        TableSpec('copm'),
+        TableSpec('copmgrp'),
+        TableSpec('copwindbreak', astype=_PLANT_CAT),
+        TableSpec('corestrictions'),
+        TableSpec('cosoilmoist'),
+        TableSpec('cosoiltemp'),
+        TableSpec('cosurffrags'),
+        TableSpec('cosurfmorphgc'),
+        TableSpec('cosurfmorphhpp'),
+        TableSpec('cosurfmorphmr'),
+        TableSpec('cosurfmorphss'),
+        TableSpec('cotaxfmmin'),
+        TableSpec('cotaxmoistcl'),
+        TableSpec('cotext', astype=_TEXT_CAT),
+        TableSpec('cotreestomng', astype=_PLANT_CAT),
+        TableSpec('cotxfmother'),
+        TableSpec('distinterpmd', partition=True),
+        TableSpec('distlegendmd'),
+        TableSpec('distmd'),
+        TableSpec('laoverlap'),
+        TableSpec('legend'),
+        TableSpec('legendtext'),
+        TableSpec('mapunit', astype=_MUKEY_INT),
+        TableSpec('muaggatt', astype=_MUKEY_INT),
+        TableSpec('muaoverlap', astype=_MUKEY_INT),
+        TableSpec('mucropyld', astype=_MUKEY_INT),
+        TableSpec('mutext', astype=_MUKEY_INT),
+        TableSpec('sacatalog'),
+        TableSpec('sainterp', partition=True),
+        TableSpec('valu1', ssurgo_only=True, astype=_MUKEY_INT),
+    ]
+})
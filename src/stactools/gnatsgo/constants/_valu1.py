@@ -0,0 +1,7 @@
+"""Descriptions of the valu1 table and its columns, from the gSSURGO
+documentation."""
+import json
+import pkgutil
+
+VALU1_DESCRIPTIONS = json.loads(
+    pkgutil.get_data(__package__, 'valu1_descriptions.json'))  # type: ignore
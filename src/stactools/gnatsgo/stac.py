@@ -1,14 +1,20 @@
+import json
 import logging
 import os
-from typing import Dict, List, Optional, Union
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple, Union
 
+import fsspec
+import pyarrow
+import pyarrow.dataset
 import pyarrow.parquet as pq
 import rasterio
 import stac_table
 from pystac import (Asset, Collection, Extent, Item, MediaType, SpatialExtent,
                     TemporalExtent)
 from pystac.extensions.projection import ProjectionExtension
-from pystac.extensions.raster import RasterBand, RasterExtension
+from pystac.extensions.raster import RasterExtension
 from shapely.geometry import box, mapping
 from stactools.core.io import ReadHrefModifier
 
@@ -19,18 +25,56 @@ from stactools.gnatsgo.utils import bounds_to_geojson, overall_bbox
 
 logger = logging.getLogger(__name__)
 
+# number of parquet table descriptions kept by _table_description; bound it
+# when building many collections in a long-running process
+META_CACHE_MAX = int(os.environ.get('GNATSGO_META_CACHE_MAX', 128))
 
-def create_collection(parquet_path: str) -> Collection:
+# number of table descriptions create_collection reads concurrently
+META_READ_WORKERS = 16
+
+# number of COG headers _create_item_from_tile reads concurrently
+TILE_PROBE_WORKERS = 8
+
+# the mukey rasters have no band description of their own
+MUKEY_DESCRIPTION = "Map unit key is the unique identifier of a record in the Mapunit table."  # noqa
+
+
+@lru_cache(maxsize=META_CACHE_MAX)
+def _table_description(table_path: str, storage_options_json: str) -> str:
+    """Read a table's description from its parquet metadata.
+
+    Uses the dataset's _common_metadata file, falling back to the footer of
+    the first data file for datasets written without one. No row groups are
+    read either way.
+    """
+    fs, path = fsspec.core.url_to_fs(table_path,
+                                     **json.loads(storage_options_json))
+    try:
+        # the file is only the schema, so fetch it whole in one request
+        # rather than in the footer-sized range reads of read_schema
+        buffer = fs.cat_file(f"{path}/_common_metadata")
+        schema = pq.read_schema(pyarrow.BufferReader(buffer))
+    except FileNotFoundError:
+        schema = pyarrow.dataset.dataset(path,
+                                         filesystem=fs,
+                                         format='parquet',
+                                         partitioning='hive').schema
+    return schema.metadata[b'description'].decode()
+
+
+def create_collection(parquet_path: str,
+                      storage_options: Optional[Dict] = None) -> Collection:
     """Create gnatsgo STAC Collection
 
     parquet_path is a base path where the parquet tables are stored.
                  each will be parsed for the table description.
+    storage_options are passed to fsspec when parquet_path is remote.
     Returns:
         Collection: STAC Collection object
     """
 
     extent = Extent(
-        SpatialExtent(GNATSGO_EXTENTS),
+        SpatialExtent(GNATSGO_EXTENTS.tolist()),
         TemporalExtent([GNATSGO_DATETIME, None]),
     )
 
@@ -39,23 +83,28 @@ def create_collection(parquet_path: str) -> Collection:
                             description=GNATSGO_DESCRIPTION,
                             license="proprietary",
                             providers=GNATSGO_PROVIDERS,
-                            extent=extent)
-    collection.stac_extensions.append(stac_table.SCHEMA_URI)
+                            extent=extent,
+                            stac_extensions=[stac_table.SCHEMA_URI])
     collection.keywords = [
         "Soils",
         "SSURGO",
         "USDA",
     ]
-    table_tables = []
-    for table_name in TABLES.keys():
-        logger.info(table_name)
-        s = pq.read_schema(
-            os.path.join(parquet_path, f"{table_name}.parquet",
-                         '_common_metadata'))
-        table_tables.append({
+    # each read is a small, latency-bound request, so overlap them; map keeps
+    # the results in TABLES order
+    table_paths = [
+        os.path.join(parquet_path, f"{table_name}.parquet")
+        for table_name in TABLES
+    ]
+    storage_options_json = json.dumps(storage_options or {}, sort_keys=True)
+    with ThreadPoolExecutor(max_workers=META_READ_WORKERS) as executor:
+        descriptions = executor.map(
+            lambda path: _table_description(path, storage_options_json),
+            table_paths)
+        table_tables = [{
             "name": table_name,
-            "description": s.metadata[b'description'].decode(),
-        })
+            "description": description,
+        } for table_name, description in zip(TABLES, descriptions)]
 
     collection.extra_fields["table:tables"] = table_tables
     collection.links = GNATSGO_LINKS
@@ -66,8 +115,13 @@ def create_collection(parquet_path: str) -> Collection:
 
 def create_item(asset_hrefs: Union[str, List[str]],
                 read_href_modifier: Optional[ReadHrefModifier] = None,
-                storage_options: Optional[Dict] = None) -> Item:
-    """Create a STAC Item from either a parquet file, or aa tile of gNATSGO/gSSURGO data."""
+                storage_options: Optional[Dict] = None,
+                validate: bool = True) -> Item:
+    """Create a STAC Item from either a parquet file, or aa tile of gNATSGO/gSSURGO data.
+
+    Set validate to False to skip the JSON schema validation of the Item,
+    e.g. when creating many Items that are validated separately.
+    """
     if isinstance(asset_hrefs, str):
         asset_hrefs = [asset_hrefs]
     item_id, extension = os.path.splitext(os.path.basename(asset_hrefs[0]))
@@ -76,22 +130,30 @@ def create_item(asset_hrefs: Union[str, List[str]],
         if len(asset_hrefs) > 1:
             raise ValueError('item should contain only one parquet table')
         return _create_item_from_parquet(item_id, asset_hrefs[0],
-                                         storage_options)
+                                         storage_options, validate)
     else:
         _, item_id = item_id.split('_', 1)
-        return _create_item_from_tile(item_id, asset_hrefs, read_href_modifier)
+        return _create_item_from_tile(item_id, asset_hrefs, read_href_modifier,
+                                      validate)
+
+
+@lru_cache(maxsize=1)
+def _overall_bbox() -> Tuple[float, ...]:
+    """The bbox shared by all the table Items."""
+    return tuple(overall_bbox())
 
 
 def _create_item_from_parquet(table_name: str,
                               asset_href: str,
-                              storage_options: Optional[Dict] = None) -> Item:
+                              storage_options: Optional[Dict] = None,
+                              validate: bool = True) -> Item:
 
-    bbox = overall_bbox()
-    geometry = mapping(box(*bbox))
+    bbox = _overall_bbox()
 
+    # each Item gets its own geometry, which callers are free to modify
     item = Item(id=table_name,
-                bbox=bbox,
-                geometry=geometry,
+                bbox=list(bbox),
+                geometry=mapping(box(*bbox)),
                 datetime=GNATSGO_DATETIME,
                 properties={})
 
@@ -112,77 +174,106 @@ def _create_item_from_parquet(table_name: str,
                                validate=False)
 
     item.assets['data'].href = asset_href
-    item.properties['table:columns'] = [
-        tc for tc in item.properties['table:columns']
-        if not tc['name'].startswith('__')
-    ]
-
+    # drop the pandas index columns and move the byte string column
+    # descriptions into plain strings in a single pass
+    columns = []
     for col in item.properties['table:columns']:
-        meta = col.pop('metadata', False)
-        if meta and meta.get(b'description', False):
-            col['description'] = meta[b'description'].decode()
+        if col['name'].startswith('__'):
+            continue
+        meta = col.pop('metadata', None)
+        if meta:
+            description = meta.get(b'description')
+            if description:
+                col['description'] = description.decode()
+        columns.append(col)
+    item.properties['table:columns'] = columns
 
-    item.validate()
+    if validate:
+        item.validate()
     return item
 
 
+def _probe(href: str) -> Dict[str, Any]:
+    """Read everything an Item needs from a raster's header in one open, with
+    whatever GDAL configuration the caller has set.
+    """
+    with rasterio.open(href, sharing=False) as dataset:
+        return {
+            "crs": dataset.crs,
+            "bounds": list(dataset.bounds),
+            "transform": dataset.transform,
+            "shape": dataset.shape,
+            "description": dataset.descriptions[0],
+            "nodata": dataset.nodatavals[0],
+            "dtype": dataset.dtypes[0],
+        }
+
+
 def _create_item_from_tile(
         tile_id: str,
         asset_hrefs: List[str],
-        read_href_modifier: Optional[ReadHrefModifier] = None) -> Item:
+        read_href_modifier: Optional[ReadHrefModifier] = None,
+        validate: bool = True) -> Item:
     if read_href_modifier:
         modified_hrefs = [read_href_modifier(href) for href in asset_hrefs]
     else:
         modified_hrefs = asset_hrefs
 
-    with rasterio.open(modified_hrefs[0]) as dataset:
-        epsg = dataset.crs.to_epsg()
-        wkt = dataset.crs.wkt
-        bbox = list(dataset.bounds)
-        geometry = mapping(box(*bbox))
-        transform = dataset.transform
-        shape = dataset.shape
+    # open each asset exactly once; the first also supplies the item geometry.
+    # The header reads are latency-bound, so overlap them
+    with ThreadPoolExecutor(max_workers=TILE_PROBE_WORKERS) as executor:
+        probes = list(executor.map(_probe, modified_hrefs))
+
+    crs = probes[0]["crs"]
+    bbox = probes[0]["bounds"]
+    geometry = mapping(box(*bbox))
+    transform = probes[0]["transform"]
 
-    transformed_bbox, transformed_geom = bounds_to_geojson(bbox, dataset.crs)
+    transformed_bbox, transformed_geom = bounds_to_geojson(bbox, crs)
     item = Item(id=tile_id,
                 geometry=transformed_geom,
                 bbox=transformed_bbox,
                 datetime=GNATSGO_DATETIME,
                 properties={},
-                stac_extensions=[])
+                stac_extensions=[
+                    ProjectionExtension.get_schema_uri(),
+                    RasterExtension.get_schema_uri(),
+                ])
 
     item.add_links(GNATSGO_LINKS)
 
-    projection = ProjectionExtension.ext(item, add_if_missing=True)
-    projection.epsg = epsg
-    projection.wkt2 = wkt
+    projection = ProjectionExtension.ext(item)
+    # the WKT is only needed when there is no EPSG code for the CRS
+    projection.epsg = crs.to_epsg()
+    if projection.epsg is None:
+        projection.wkt2 = crs.wkt
     projection.transform = transform[0:6]
-    projection.shape = shape
+    projection.shape = probes[0]["shape"]
     projection.geometry = geometry
     projection.bbox = bbox
 
     # Create data assets
-    for i, href in enumerate(asset_hrefs):
-        title, _ = os.path.basename(href).split('_', 1)
-        title = title.replace('-', '_')
+    titles = [
+        os.path.basename(href).split('_', 1)[0].replace('-', '_')
+        for href in asset_hrefs
+    ]
+    for href, title, probe in zip(asset_hrefs, titles, probes):
+        # the extensions are declared on the item above, so the bands can be
+        # set directly rather than through RasterExtension for every asset
+        band = {"data_type": probe["dtype"], "spatial_resolution": 10}
+        if probe["nodata"] is not None:
+            band["nodata"] = probe["nodata"]
         data_asset = Asset(href=href,
                            media_type=MediaType.COG,
                            roles=["data"],
-                           title=title)
-
+                           title=title,
+                           extra_fields={"raster:bands": [band]})
+        if title == 'mukey':
+            data_asset.description = MUKEY_DESCRIPTION
+        else:
+            data_asset.description = probe["description"]
         item.add_asset(title, data_asset)
-        rb = []
-        with rasterio.open(modified_hrefs[i]) as dataset:
-            if title == 'mukey':
-                data_asset.description = "Map unit key is the unique identifier of a record in the Mapunit table."  # noqa
-            else:
-                data_asset.description = dataset.descriptions[0]
-            rb.append(
-                RasterBand.create(nodata=dataset.nodatavals[0],
-                                  data_type=dataset.dtypes[0],
-                                  spatial_resolution=10))
-        rast_ext = RasterExtension.ext(data_asset, add_if_missing=True)
-        rast_ext.bands = rb
-
-    item.validate()
+
+    if validate:
+        item.validate()
     return item
@@ -1,35 +1,225 @@
+import json
 import logging
+import math
 import os.path
 import tempfile
-
-import dask.dataframe as dd
+import threading
+from concurrent.futures import (ProcessPoolExecutor, ThreadPoolExecutor,
+                                as_completed)
+from functools import lru_cache, partial
+from multiprocessing.shared_memory import SharedMemory
+from typing import List, NamedTuple
+
+import fsspec
 import geopandas as gpd
 import numpy as np
 import pandas as pd
 import pyarrow
+import pyarrow.dataset
+import pyarrow.parquet as pq
+import pyogrio
 import rasterio
 from osgeo import gdal, ogr
 from pandas import CategoricalDtype, StringDtype
 from pyproj import CRS
 from pyproj.transformer import Transformer
-from rasterio.windows import from_bounds
+from rasterio.windows import Window, from_bounds
 from shapely.geometry import box, mapping
 from stactools.core.utils.convert import cogify
 
-from stactools.gnatsgo.constants import (DEFAULT_TILE_SIZE, GNATSGO_EXTENTS,
-                                         PRODUCT, TABLES, VALU1_DESCRIPTIONS)
+# isort and yapf wrap long imports differently; leave this one to isort
+# yapf: disable
+from stactools.gnatsgo.constants import (BOOLEAN_FALSE, BOOLEAN_TRUE,
+                                         COLUMN_WORKERS, DEFAULT_TILE_SIZE,
+                                         GDB_READ_CHUNK_SIZE, GDB_WORKERS,
+                                         GNATSGO_EXTENTS,
+                                         PARQUET_ROW_GROUP_SIZE,
+                                         PARQUET_WRITE_OPTIONS,
+                                         PROBE_CHUNK_SIZE, PRODUCT,
+                                         STATE_INDEX, TABLES,
+                                         VALU1_DESCRIPTIONS, TableSpec)
+
+# yapf: enable
 
 logger = logging.getLogger(__name__)
 
 
+def read_gdb_layer(gdbfile,
+                   layer,
+                   engine='pyogrio',
+                   ignore_geometry=True,
+                   ignore_fields=None,
+                   columns=None):
+    """Read a single layer from a file geodatabase into a dataframe.
+
+    The pyogrio engine reads through GDAL's vectorized API, and is much faster
+    than fiona's feature-at-a-time iteration for the large SSURGO tables.
+    If columns is given, only those fields are returned; the pyogrio engine
+    also skips reading the others.
+    """
+    if engine == 'pyogrio':
+        if ignore_fields:
+            if columns is None:
+                columns = pyogrio.read_info(gdbfile, layer=layer)['fields']
+            columns = [f for f in columns if f not in ignore_fields]
+        return pyogrio.read_dataframe(gdbfile,
+                                      layer=layer,
+                                      columns=columns,
+                                      read_geometry=not ignore_geometry)
+    elif engine == 'fiona':
+        try:
+            import fiona  # noqa: F401
+        except ImportError as e:
+            raise ImportError(
+                "the fiona engine needs fiona, which can be installed with "
+                "the 'fiona' extra") from e
+        # name the engine, as newer geopandas default to pyogrio
+        df = gpd.read_file(gdbfile,
+                           engine='fiona',
+                           driver='OpenFileGDB',
+                           layer=layer,
+                           ignore_geometry=ignore_geometry,
+                           ignore_fields=ignore_fields)
+        if columns is not None:
+            df = df[[c for c in df.columns if c in columns or c == 'geometry']]
+        return df
+    else:
+        raise ValueError(f"unsupported engine: {engine}")
+
+
+def iter_gdb_layer(gdbfile,
+                   layer,
+                   engine='pyogrio',
+                   ignore_geometry=True,
+                   ignore_fields=None,
+                   chunk_size=None):
+    """Read a layer from a file geodatabase as a series of dataframes of at
+    most chunk_size (by default GDB_READ_CHUNK_SIZE) rows, so large layers
+    never need to be held in memory at once.
+
+    Always yields at least one (possibly empty) dataframe. The fiona engine
+    can't read a slice of the layer, so it yields the whole layer at once.
+    """
+    if engine != 'pyogrio':
+        yield read_gdb_layer(gdbfile, layer, engine, ignore_geometry,
+                             ignore_fields)
+        return
+
+    if chunk_size is None:
+        chunk_size = GDB_READ_CHUNK_SIZE
+    info = pyogrio.read_info(gdbfile, layer=layer)
+    columns = None
+    if ignore_fields:
+        columns = [f for f in info['fields'] if f not in ignore_fields]
+    offset = 0
+    while True:
+        chunk = pyogrio.read_dataframe(gdbfile,
+                                       layer=layer,
+                                       columns=columns,
+                                       read_geometry=not ignore_geometry,
+                                       skip_features=offset,
+                                       max_features=chunk_size)
+        yield chunk
+        offset += chunk_size
+        # the feature count is -1 when GDAL doesn't know it, so a short chunk
+        # also marks the end of the layer
+        if len(chunk) < chunk_size or 0 <= info['features'] <= offset:
+            break
+
+
+@lru_cache(maxsize=None)
+def _gdb_metadata(gdbfile, engine):
+    """Read the metadata tables describing the columns (mdstattabcols) and
+    categorical values (mdstatdomdet) of a geodatabase. These are the same
+    for every table, so they are only read once per process.
+
+    Returns {table name: column metadata indexed by column name} and
+    {domain name: possible values}, so that each lookup is a hashed one
+    rather than a scan of the whole metadata table.
+    """
+    column_meta = read_gdb_layer(gdbfile,
+                                 'mdstattabcols',
+                                 engine=engine,
+                                 columns=[
+                                     'tabphyname', 'colphyname', 'coldesc',
+                                     'uom', 'logicaldatatype', 'domainname'
+                                 ])
+    choices = read_gdb_layer(gdbfile,
+                             'mdstatdomdet',
+                             engine=engine,
+                             columns=['domainname', 'choice'])
+    tables = {
+        table_name: meta.drop_duplicates('colphyname').set_index('colphyname')
+        for table_name, meta in column_meta.groupby('tabphyname')
+    }
+    domains = {
+        domain_name: domain.choice.values
+        for domain_name, domain in choices.groupby('domainname')
+    }
+    return tables, domains
+
+
+@lru_cache(maxsize=None)
+def _gdb_fields(gdbfile):
+    """Read the field definitions of every layer of a geodatabase, as
+    {layer name: [(field name, type name, subtype)]}, opening it only once
+    per process rather than once per table. Layer names are lowercased, as
+    GDAL matches them without regard to case.
+    """
+    driver = ogr.GetDriverByName('OpenFileGDB')
+    f = driver.Open(gdbfile)
+    fields = {}
+    for i in range(f.GetLayerCount()):
+        ld = f.GetLayerByIndex(i).GetLayerDefn()
+        fields[ld.GetName().lower()] = [(ld.GetFieldDefn(j).GetName(),
+                                         ld.GetFieldDefn(j).GetTypeName(),
+                                         ld.GetFieldDefn(j).GetSubType())
+                                        for j in range(ld.GetFieldCount())]
+    return fields
+
+
+def _prefetch(chunks):
+    """Iterate over chunks, producing the next one in a background thread
+    while the caller works on the current one.
+    """
+    chunks = iter(chunks)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        future = executor.submit(next, chunks, None)
+        while True:
+            chunk = future.result()
+            if chunk is None:
+                return
+            future = executor.submit(next, chunks, None)
+            yield chunk
+
+
+# the dtype of each (non categorical) logical data type of the metadata table
+_LOGICAL_DTYPES = {
+    'Boolean': 'boolean',
+    # pandas needs the unit; a bare datetime64 is rejected
+    'Date/Time': 'datetime64[ns]',
+    # Arrow backed, so that the parquet writer
+    # uses the strings without converting them again
+    'String': StringDtype('pyarrow'),
+    'Vtext': StringDtype('pyarrow'),
+}
+
+
 class Table:
 
-    def __init__(self, table_name, in_dir, description=None, has_geom=False):
+    def __init__(self,
+                 table_name,
+                 in_dir,
+                 description=None,
+                 has_geom=False,
+                 engine='pyogrio'):
         self.table_name = table_name
         self.description = description
         self.has_geom = has_geom
-        self.ssurgo_only = TABLES.get(table_name, {}).get('ssurgo_only', False)
-        self.partition = TABLES.get(table_name, {}).get('partition', False)
+        self.engine = engine
+        self.spec = TABLES.get(table_name, TableSpec(table_name))
+        self.ssurgo_only = self.spec.ssurgo_only
+        self.partition = self.spec.partition
         self.in_dir = in_dir
         self._file_list()
         self._table_def()
@@ -68,45 +258,32 @@ class Table:
 
     def _table_def(self):
         # get any speficified conversions from constants
-        self.astype = TABLES.get(self.table_name, {}).get('astype', {})
+        # copy, since the inferred types are added to this below
+        self.astype = dict(self.spec.astype)
         if self.partition:
             # we will partition by state by adding a 'state' column
             # set up a categorical type for the column
-            all_states = []
-            for prod in PRODUCT:
-                all_states += PRODUCT[prod]['CONUS']
-                all_states += PRODUCT[prod]['NON_CONUS']
-            self.astype['state'] = CategoricalDtype(all_states)
+            self.astype['state'] = CategoricalDtype(list(STATE_INDEX))
 
         # inspect gdb for column types that should be converted
         # hope that the first gdb is representative
         gdbfile = self.files['AK']
         # grab the metadata table that describes the columns
-        column_meta = gpd.read_file(gdbfile,
-                                    driver='OpenFileGDB',
-                                    layer='mdstattabcols',
-                                    ignore_geometry=True)
-        column_meta = column_meta[column_meta.tabphyname == self.table_name]
-        # grab the metadata table that describes the categorical types
-        choices = gpd.read_file(gdbfile,
-                                driver='OpenFileGDB',
-                                layer='mdstatdomdet',
-                                ignore_geometry=True)
-
-        # also open the gdb to inspect field definitions
-        driver = ogr.GetDriverByName('OpenFileGDB')
-        f = driver.Open(gdbfile)
-        ld = f.GetLayerByName(self.table_name).GetLayerDefn()
+        # (along with the metadata table that describes the categorical types)
+        tables, domains = _gdb_metadata(gdbfile, self.engine)
+        column_meta = tables.get(self.table_name)
+
+        # along with the field definitions of the table
+        fields = _gdb_fields(gdbfile)[self.table_name.lower()]
 
         self.columns = {}
-        for i in range(ld.GetFieldCount()):
-            col = ld.GetFieldDefn(i).GetName()
+        for col, type_name, subtype in fields:
             self.columns[col] = {}
 
             self.columns[col]['meta'] = {}
             if self.table_name != 'valu1':  # valu1 is not in metadata tables
                 # stash the column description and units for later use
-                meta = column_meta[column_meta.colphyname == col].iloc[0]
+                meta = column_meta.loc[col]
                 if meta.coldesc:
                     self.columns[col]['meta']['description'] = meta.coldesc
                 if meta.uom:
@@ -117,30 +294,25 @@ class Table:
                     col]
 
             if col not in self.astype:  # don't override things we specified
-                if ld.GetFieldDefn(i).GetTypeName() == 'Integer':
-                    if ld.GetFieldDefn(i).GetSubType() == 2:
+                if type_name == 'Integer':
+                    if subtype == ogr.OFSTInt16:
                         self.astype[col] = 'Int16'
                     else:
                         self.astype[col] = 'Int32'
-                elif ld.GetFieldDefn(i).GetTypeName() == 'Real':
+                elif type_name == 'Real':
                     self.astype[col] = 'float32'
                 elif self.table_name != 'valu1':
                     # valu1 is not in metadata table, but luckily has only ints/floats
                     if meta.logicaldatatype == 'Choice':
                         # lookup possible categorical values and create type
-                        cats = choices[choices.domainname ==
-                                       meta.domainname].choice.values
+                        cats = domains.get(meta.domainname, [])
                         if len(cats):
                             self.astype[col] = CategoricalDtype(cats)
                         else:
                             self.astype[col] = 'category'
                     else:
-                        self.astype[col] = {
-                            'Boolean': 'boolean',
-                            'Date/Time': 'datetime64',
-                            'String': StringDtype(),
-                            'Vtext': StringDtype(),
-                        }[meta.logicaldatatype]
+                        self.astype[col] = _LOGICAL_DTYPES[
+                            meta.logicaldatatype]
 
     def _precompute_categoricals(self):
         """All partitions must use the same CategoricalDtype for a column.
@@ -149,108 +321,219 @@ class Table:
         """
         categoricals = [
             k for k, v in self.astype.items()
-            if v == 'category' and not isinstance(v, CategoricalDtype)
+            if v == 'category' and getattr(v, 'categories', None) is None
         ]
         if categoricals:
-            ignores = list(set(self.columns.keys()) - set(categoricals))
-            tmp = self.concat_table(ignore_fields=ignores)
+            # collect the values (in first seen order) from each gdb
+            seen = {c: {} for c in categoricals}
+            for gdbfile in self.files.values():
+                if self.engine == 'pyogrio':
+                    # let GDAL find the distinct values, so that only those
+                    # are read rather than every row of the columns
+                    query = f'SELECT DISTINCT "{{}}" FROM "{self.table_name}"'
+                    chunks = [
+                        pyogrio.read_dataframe(gdbfile,
+                                               sql=query.format(c),
+                                               read_geometry=False)
+                        for c in categoricals
+                    ]
+                else:
+                    # read only those columns, chunk by chunk
+                    ignores = list(set(self.columns) - set(categoricals))
+                    chunks = iter_gdb_layer(gdbfile,
+                                            self.table_name,
+                                            engine=self.engine,
+                                            ignore_fields=ignores)
+                for chunk in chunks:
+                    for c in categoricals:
+                        if c in chunk.columns:
+                            seen[c].update(
+                                dict.fromkeys(chunk[c].dropna().unique()))
             for c in categoricals:
-                categories = list(tmp[c].unique())
-                if None in categories:
-                    categories.remove(None)
-                self.astype[c] = CategoricalDtype(categories)
-
-    def _schema(self, dataframe):
-        """Inject column and table metadata (descriptions, units) into
-        the parquet schema.
+                self.astype[c] = CategoricalDtype(list(seen[c]))
+
+    def _schema(self):
+        """Build the parquet schema from the column types, and inject column
+        and table metadata (descriptions, units) into it.
         """
         if self.schema is not None:  # only need to create once
             return self.schema
 
-        self.schema = pyarrow.Schema.from_pandas(dataframe,
-                                                 preserve_index=False)
+        # the Arrow types pandas converts each dtype to, worked out from an
+        # empty frame so that the schema doesn't depend on the data read
+        columns = list(self.columns) + (['state'] if self.partition else [])
+        empty = pd.DataFrame(
+            {col: pd.Series([], dtype=self.astype[col])
+             for col in columns})
+        # then attach the metadata while assembling the schema, rather than
+        # replacing one field (and copying the schema) at a time
+        fields = []
+        for field in pyarrow.Schema.from_pandas(empty, preserve_index=False):
+            meta = self.columns.get(field.name, {}).get('meta', False)
+            if meta and not field.name.startswith('__'):
+                field = field.with_metadata(meta)
+            fields.append(field)
+        metadata = None
         if self.description is not None:
-            self.schema = self.schema.with_metadata(
-                {'description': self.description})
-        for col in self.schema.names:
-            if not col.startswith('__'):
-                i = self.schema.get_field_index(col)
-                if self.columns.get(col, {}).get('meta', False):
-                    field = self.schema.field(i).with_metadata(
-                        self.columns[col]['meta'])
-                    self.schema = self.schema.set(i, field)
+            metadata = {'description': self.description}
+        self.schema = pyarrow.schema(fields, metadata=metadata)
 
         return self.schema
 
+    def _parquet_writer(self, out_dir, partition=None):
+        """Open a pyarrow ParquetWriter for the table, which chunks are then
+        written to with _write_chunk.
+
+        Output is a parquet dataset directory; partitions are written
+        hive-style under state=<partition>/.
+        """
+        schema = self._schema()
+        part_dir = os.path.join(out_dir, f"{self.table_name}.parquet")
+        if partition is not None:
+            # the partition value is encoded in the path, not the file
+            part_dir = os.path.join(part_dir, f"state={partition}")
+            schema = schema.remove(schema.get_field_index('state'))
+        os.makedirs(part_dir, exist_ok=True)
+        return pq.ParquetWriter(os.path.join(part_dir, 'part.0.parquet'),
+                                schema, **PARQUET_WRITE_OPTIONS)
+
+    def _convert(self, dataframe):
+        """Convert a chunk's columns to the table's types, without copying
+        the columns that already have them.
+        """
+        types = {
+            k: v
+            for k, v in self.astype.items() if k in dataframe.columns
+        }
+        return dataframe.astype(types, copy=False)
+
+    def _write_chunk(self, writer, dataframe):
+        if 'mukey' in dataframe.columns:
+            # tables are looked up by mukey, so keep each row group's mukey
+            # statistics tight enough for readers to skip row groups
+            dataframe = dataframe.sort_values('mukey', kind='stable')
+        table = pyarrow.Table.from_pandas(dataframe,
+                                          schema=writer.schema,
+                                          preserve_index=False)
+        writer.write_table(table, row_group_size=PARQUET_ROW_GROUP_SIZE)
+
+    def _read_region(self, reg, ignore_fields=None):
+        """Read a region's GDB in chunks, with the boolean columns converted.
+        """
+        logger.info(self.files[reg])
+        # compare only the plain string types, rather than asking every
+        # dtype object in astype whether it equals 'boolean'
+        booleans = [
+            k for k, v in self.astype.items()
+            if isinstance(v, str) and v == 'boolean'
+        ]
+        for tt in iter_gdb_layer(self.files[reg],
+                                 self.table_name,
+                                 engine=self.engine,
+                                 ignore_geometry=(not self.has_geom),
+                                 ignore_fields=ignore_fields):
+            for col in [k for k in booleans if k in tt.columns]:
+                # boolean columns are a mess of 1-3 character strings.
+                # convert to something sensible, building the BooleanArray
+                # directly from hashed lookups rather than going through an
+                # object column
+                true = tt[col].isin(BOOLEAN_TRUE).to_numpy()
+                false = tt[col].isin(BOOLEAN_FALSE).to_numpy()
+                tt[col] = pd.arrays.BooleanArray(true, ~(true | false))
+            yield tt
+
+    def _write_region(self, reg, out_dir):
+        """Convert a region's GDB to its partition of the parquet dataset.
+        The chunks don't get a 'state' column, as the partition's directory
+        holds its value.
+        """
+        with self._parquet_writer(out_dir, partition=reg) as writer:
+            for tt in self._read_region(reg):
+                self._write_chunk(writer, self._convert(tt))
+        return reg
+
     def concat_table(self, ignore_fields=None, out_dir=None):
         """Combine state or regional geodatabases for a given table_name.
 
-        If out_dir is specified, resulting table will be written to parquet.
-        Otherwise, a geopandas dataframe is returned.
+        If out_dir is specified, resulting table will be written to parquet,
+        reading and writing the geodatabases in chunks, with a
+        _common_metadata file holding the full schema. Otherwise, a geopandas
+        dataframe is returned.
         """
-        if self.partition and out_dir:
-            self._precompute_categoricals()
-
-        t = None
-        for reg in self.files:
-            logger.info(self.files[reg])
-            tt = gpd.read_file(self.files[reg],
-                               driver='OpenFileGDB',
-                               layer=self.table_name,
-                               ignore_geometry=(not self.has_geom),
-                               ignore_fields=ignore_fields)
-            for col in [
-                    k for k, v in self.astype.items()
-                    if v == 'boolean' and k in tt.columns
-            ]:
-                # boolean columns are a mess of 1-3 character strings.
-                # convert to something sensible.
-                tt[col] = tt[col].map({
-                    'Yes': True,
-                    'No ': False,
-                    'No': False,
-                    '1  ': True,
-                    '0  ': False
-                })
-            if out_dir and self.partition:
-                # convert types, add the 'state' column for the partition,
-                # and write parquet file for this partition
-                tt['state'] = reg
-                tt = tt.astype(self.astype)
-                tt.info(memory_usage="deep")
-                ddtt = dd.from_pandas(tt, npartitions=1)
-                ddtt.to_parquet(os.path.join(out_dir,
-                                             f"{self.table_name}.parquet"),
-                                partition_on=['state'],
-                                schema=self._schema(tt),
-                                engine='pyarrow',
-                                compression='snappy')
-            else:
-                t = tt if t is None else t.append(tt)
-
-        if out_dir and not self.partition:
-            # convert types and write single parquet file
-            t = t.astype(self.astype)
-            t.info(memory_usage="deep")
-            ddt = dd.from_pandas(t, npartitions=1)
-            ddt.to_parquet(os.path.join(out_dir, f"{self.table_name}.parquet"),
-                           schema=self._schema(t),
-                           engine='pyarrow',
-                           compression='snappy')
         if not out_dir:
-            return t
-
+            # every region ends up in memory anyway, so read them
+            # concurrently, then do a single concat rather than copying the
+            # accumulated frame for each region
+            with ThreadPoolExecutor(max_workers=GDB_WORKERS) as executor:
+                regions = executor.map(
+                    lambda reg: list(self._read_region(reg, ignore_fields)),
+                    self.files)
+                frames = [tt for chunks in regions for tt in chunks]
+            return pd.concat(frames, ignore_index=True, copy=False)
+
+        # chunks are converted independently, so every one of them must use
+        # the same categories
+        self._precompute_categoricals()
+        self._schema()
 
-def to_parquet(in_dir, out_dir, tables=None):
-    mdstattabs = gpd.read_file(os.path.join(in_dir, 'gSSURGO_CONUS.gdb'),
-                               driver='OpenFileGDB',
-                               layer='mdstattabs')
+        if self.partition:
+            # each partition is a separate file, so the regions can be read
+            # and written concurrently; the GDAL reads and parquet writes
+            # release the GIL
+            with ThreadPoolExecutor(max_workers=GDB_WORKERS) as executor:
+                for reg in executor.map(
+                        partial(self._write_region, out_dir=out_dir),
+                        self.files):
+                    logger.info("finished %s", reg)
+        else:
+            # convert types and write chunks to a single parquet file, reading
+            # the next chunk while the current one is written
+            chunks = (tt for reg in self.files
+                      for tt in self._read_region(reg, ignore_fields))
+            with self._parquet_writer(out_dir) as writer:
+                for tt in _prefetch(chunks):
+                    self._write_chunk(writer, self._convert(tt))
+
+        pq.write_metadata(
+            self.schema,
+            os.path.join(out_dir, f"{self.table_name}.parquet",
+                         '_common_metadata'))
+
+
+def _convert_table(in_dir, out_dir, table_name, description, engine):
+    """Convert a single table to parquet. Module level so that it can be
+    submitted to a process pool; each worker opens its own GDB handles.
+    """
+    t = Table(table_name, in_dir, description=description, engine=engine)
+    t.concat_table(out_dir=out_dir)
+    return table_name
+
+
+def to_parquet(in_dir, out_dir, tables=None, engine='pyogrio', jobs=1):
+    conus_gdb = os.path.join(in_dir, 'gSSURGO_CONUS.gdb')
     if not tables:
         # do 'em all
         tables = TABLES.keys()
+    else:
+        # listing layers only reads the gdb's catalog, so unknown table names
+        # fail fast instead of after the other tables have been converted;
+        # GDAL matches layer names without regard to case, so do the same
+        layers = pyogrio.list_layers(conus_gdb)[:, 0]
+        layers = {name.lower(): name for name in layers}
+        missing = [t for t in tables if t.lower() not in layers]
+        if missing:
+            raise ValueError(f"tables not found in {conus_gdb}: "
+                             f"{', '.join(missing)}")
+        # but everything after this looks tables up by their exact name, so
+        # use the name from TABLES, or else the layer's own
+        layers.update({name.lower(): name for name in TABLES})
+        tables = [layers[t.lower()] for t in tables]
+    mdstattabs = read_gdb_layer(conus_gdb,
+                                'mdstattabs',
+                                engine=engine,
+                                columns=['tabphyname', 'tabdesc'])
+    jobs_args = []
     for table_name in tables:
-        logger.info(table_name)
-        logger.info("  concatting table")
         desc = None
         if table_name != 'valu1':  # valu1 is not in metadata tables
             descriptions = mdstattabs[mdstattabs.tabphyname ==
@@ -259,61 +542,145 @@ def to_parquet(in_dir, out_dir, tables=None):
                 desc = descriptions.item()
         else:
             desc = VALU1_DESCRIPTIONS['table']
-
-        t = Table(table_name, in_dir, description=desc)
-        t.concat_table(out_dir=out_dir)
+        jobs_args.append((in_dir, out_dir, table_name, desc, engine))
+
+    if jobs > 1:
+        # tables are independent, so convert them in parallel
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            futures = [
+                executor.submit(_convert_table, *args) for args in jobs_args
+            ]
+            for future in as_completed(futures):
+                logger.info("finished %s", future.result())
+    else:
+        for args in jobs_args:
+            logger.info(args[2])
+            logger.info("  concatting table")
+            _convert_table(*args)
 
 
 def overall_bbox():
-    min_lon = 180
-    min_lat = 90
-    max_lon = -180
-    max_lat = -90
-    for bbox in GNATSGO_EXTENTS:
-        if bbox[0] < min_lon:
-            min_lon = bbox[0]
-        if bbox[1] < min_lat:
-            min_lat = bbox[1]
-        if bbox[2] > max_lon:
-            max_lon = bbox[2]
-        if bbox[3] > max_lat:
-            max_lat = bbox[3]
-    return [min_lon, min_lat, max_lon, max_lat]
+    return [
+        *GNATSGO_EXTENTS[:, :2].min(axis=0).tolist(),
+        *GNATSGO_EXTENTS[:, 2:].max(axis=0).tolist(),
+    ]
+
+
+@lru_cache(maxsize=None)
+def _to_wgs84(in_crs) -> Transformer:
+    """Transformer from a CRS to lon/lat, built once per CRS; there are only
+    a handful of them across all the tiles.
+    """
+    return Transformer.from_crs(in_crs, CRS.from_epsg(4326), always_xy=True)
 
 
 def bounds_to_geojson(bbox: list, in_crs: int) -> tuple:
-    transformer = Transformer.from_crs(in_crs,
-                                       CRS.from_epsg(4326),
-                                       always_xy=True)
+    transformer = _to_wgs84(in_crs)
     transformed_bbox = list(transformer.transform_bounds(*bbox))
     return transformed_bbox, mapping(box(*transformed_bbox, ccw=True))
 
 
-def tile(in_dir, out_dir, size=DEFAULT_TILE_SIZE):
+def tile(in_dir, out_dir, size=DEFAULT_TILE_SIZE, workers=1):
     """Mosiacs state rasters and tile to a grid"""
     for prod in PRODUCT:
         for state in PRODUCT[prod]['NON_CONUS']:
             logger.info(state)
-            tile_image(os.path.join(in_dir, f"{prod}_{state}.tif"), out_dir,
-                       size, state.lower())
+            tile_image(os.path.join(in_dir, f"{prod}_{state}.tif"),
+                       out_dir,
+                       size,
+                       state.lower(),
+                       workers=workers)
     with tempfile.TemporaryDirectory() as tmpdir:
         vrt_file = os.path.join(tmpdir, 'mukey.vrt')
         create_conus_vrt(in_dir, vrt_file)
-        tile_image(vrt_file, out_dir, size, "conus")
-
-
-def tile_image(infile, outdir, size, basename=None):
+        tile_image(vrt_file, out_dir, size, "conus", workers=workers)
+
+
+def align_tile_size(dataset, size):
+    """Snap a tile size (in CRS units) down to a whole number of the
+    dataset's internal block width.
+
+    Tiles start at the left edge, so their columns line up with the blocks.
+    They also start at the bottom edge, so their rows only line up when the
+    dataset's height is a whole number of blocks; otherwise tile windows
+    still straddle block rows.
+    """
+    block_height, block_width = dataset.block_shapes[0]
+    if block_height == 1 or block_width == dataset.width:
+        logger.warning(
+            "%s is stripped rather than tiled; converting it to a tiled "
+            "GeoTIFF before tiling will be much faster", dataset.name)
+        return size
+    block_size = block_width * abs(dataset.transform.a)
+    aligned = math.floor(size / block_size) * block_size
+    return aligned if aligned > 0 else size
+
+
+def window_has_data(dataset, window, chunk_size=PROBE_CHUNK_SIZE):
+    """Check for any valid pixel in a window of band 1.
+
+    The window is read in chunks, returning at the first valid pixel, so
+    memory use doesn't depend on the tile size.
+    """
+    window = window.round_offsets().round_lengths()
+    row_stop = int(window.row_off + window.height)
+    col_stop = int(window.col_off + window.width)
+    for row in range(int(window.row_off), row_stop, chunk_size):
+        for col in range(int(window.col_off), col_stop, chunk_size):
+            chunk = Window(col, row, min(chunk_size, col_stop - col),
+                           min(chunk_size, row_stop - row))
+            if np.any(dataset.read(1, window=chunk) != dataset.nodata):
+                return True
+    return False
+
+
+def window_is_empty(dataset, window):
+    """Check whether GDAL knows a window of band 1 is empty without reading
+    it: parts of a VRT that no source covers, or sparse GeoTIFF blocks.
+
+    False means the window has to be read to find out.
+    """
+    window = window.round_offsets().round_lengths().intersection(
+        Window(0, 0, dataset.width, dataset.height))
+    # keep a reference to the dataset while the band is used; GDAL before 3.8
+    # can crash if the dataset is freed out from under its band
+    ds = gdal.Open(dataset.name)
+    band = ds.GetRasterBand(1)
+    flags, _ = band.GetDataCoverageStatus(int(window.col_off),
+                                          int(window.row_off),
+                                          int(window.width),
+                                          int(window.height))
+    band = ds = None
+    return flags == gdal.GDAL_DATA_COVERAGE_STATUS_EMPTY
+
+
+def _subset_tile(infile, outdir, basename, workers, tile):
+    """Write a single tile, if it has any valid data. Module level so that it
+    can be submitted to a process pool.
+    """
+    with rasterio.Env(GDAL_CACHEMAX=512), rasterio.open(infile) as dataset:
+        window = from_bounds(*tile, dataset.transform)
+        if (window_is_empty(dataset, window)
+                or not window_has_data(dataset, window)):
+            logger.warn("   no data -- skipping")
+            return None
+    return tile.subset(infile, outdir, basename, workers=workers)
+
+
+def tile_image(infile, outdir, size, basename=None, workers=1):
     with rasterio.open(infile) as dataset:
+        size = align_tile_size(dataset, size)
         tiles = create_tiles(*dataset.bounds, size)
+    subset = partial(_subset_tile, infile, outdir, basename, workers)
+    if workers > 1:
+        # each tile is read and written independently, so write them in
+        # parallel
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for _ in executor.map(subset, tiles):
+                pass
+    else:
         for tile in tiles:
-            td = dataset.read(1,
-                              window=from_bounds(tile._left, tile._bottom,
-                                                 tile._right, tile._top,
-                                                 dataset.transform))
-            if not np.all(td == dataset.nodata):
-                tile.subset(infile, outdir, basename)
-            else:
-                logger.warn("   no data -- skipping")
+            subset(tile)
 
 
 def create_conus_vrt(in_dir, outfile):
@@ -323,104 +690,257 @@ def create_conus_vrt(in_dir, outfile):
             os.path.join(in_dir, f"{prod}_{state}.tif")
             for state in PRODUCT[prod]['CONUS']
         ]
-    gdal.BuildVRT(outfile, file_list)
+    # the state rasters share a grid, so nearest neighbour at the highest
+    # resolution places the pixels as they are, rather than averaging
+    # resolutions and resampling
+    options = gdal.BuildVRTOptions(resolution='highest', resampleAlg='nearest')
+    gdal.BuildVRT(outfile, file_list, options=options)
 
 
 def create_tiles(left, bottom, right, top, size):
-    x = left
-    y = bottom
-    tiles = []
-    while x < right:
-        while y < top:
-            tile = Tile(x, y, min(x + size, right), min(y + size, top))
-            tiles.append(tile)
-            y += size
-        x += size
-        y = bottom
-    return tiles
-
-
-class Tile:
-
-    def __init__(self, left, bottom, right, top):
-        self._left = left
-        self._bottom = bottom
-        self._right = right
-        self._top = top
-
-    def subset(self, infile, outdir, base):
-        tile_id = (f"{base}_{str(int(self._left))}_{str(int(self._top))}_"
-                   f"{str(int(self._right))}_{str(int(self._bottom))}")
+    # tile origins, column by column, with the last row and column clipped to
+    # the bounds
+    x, y = np.meshgrid(np.arange(left, right, size),
+                       np.arange(bottom, top, size),
+                       indexing='ij')
+    x = x.ravel()
+    y = y.ravel()
+    return [
+        Tile(*bounds) for bounds in zip(x.tolist(), y.tolist(),
+                                        np.minimum(x + size, right).tolist(),
+                                        np.minimum(y + size, top).tolist())
+    ]
+
+
+class Tile(NamedTuple):
+    left: float
+    bottom: float
+    right: float
+    top: float
+
+    def subset(self, infile, outdir, base, workers=1):
+        tile_id = (f"{base}_{str(int(self.left))}_{str(int(self.top))}_"
+                   f"{str(int(self.right))}_{str(int(self.bottom))}")
         os.makedirs(os.path.join(outdir, tile_id), exist_ok=True)
         outfile = os.path.join(outdir, tile_id, f"mukey_{tile_id}.tif")
+        # share the cpus with the other tiles being written at the same time
+        threads = 'ALL_CPUS'
+        if workers > 1:
+            threads = str(max(1, (os.cpu_count() or 1) // workers))
         extra_args = [
-            "-co", "RESAMPLING=NEAREST", "-projwin",
-            str(self._left),
-            str(self._top),
-            str(self._right),
-            str(self._bottom)
+            "-co", "RESAMPLING=NEAREST", "-co", "PREDICTOR=YES", "-co",
+            "BIGTIFF=IF_SAFER", "-co", f"NUM_THREADS={threads}", "-projwin",
+            str(self.left),
+            str(self.top),
+            str(self.right),
+            str(self.bottom)
         ]
         return cogify(infile, outfile, extra_args=extra_args)
 
 
+def _build_luts(valu1):
+    """Build the lookup arrays that map mukeys to valu1 values.
+
+    'mukey' maps a mukey directly to its row in the table. It has one extra
+    trailing slot for mukeys that fall outside the table (e.g. the raster's
+    nodata), which point at the row past the end. Each other column holds
+    its values by row, followed by the fill value for that missing row.
+
+    valu1 is a pyarrow dataset. It is read one column at a time, so only the
+    mukeys and a single column of values are in memory at once.
+    """
+    mukey = valu1.to_table(columns=['mukey']).column('mukey').to_numpy()
+    mukeys = np.unique(mukey)
+    size = int(mukeys.max()) + 2 if len(mukeys) else 1
+    # np.take widens narrower indices to intp on every call, so store the
+    # rows as intp and the per-tile row array can index each column directly
+    rows = np.full(size, len(mukeys), dtype=np.intp)
+    rows[mukeys] = np.arange(len(mukeys), dtype=np.intp)
+    luts = {'mukey': rows}
+    for field in valu1.schema:
+        if field.name == 'mukey':
+            continue
+        if pyarrow.types.is_int16(field.type):
+            dtype, fill = 'int16', -9999
+        elif pyarrow.types.is_float32(field.type):
+            dtype, fill = 'float32', np.nan
+        else:
+            raise TypeError('unsupported type')
+        values = valu1.to_table(columns=[field.name]).column(0).to_pandas()
+        first = values.groupby(mukey).first()
+        lut = np.empty(len(mukeys) + 1, dtype=dtype)
+        lut[:-1] = first.fillna(fill).to_numpy(dtype=dtype)
+        lut[-1] = fill
+        luts[field.name] = lut
+    return luts
+
+
+def _load_valu1_luts(parquet_table, storage_options=None):
+    """Read the valu1 table and build its lookup arrays, caching the result so
+    repeated create_derived_rasters calls in one process read it only once.
+
+    The cache is keyed on the table's file listing (sizes and modification
+    times) as well as its path, so a regenerated table is read again.
+    """
+    fs, path = fsspec.core.url_to_fs(parquet_table, **(storage_options or {}))
+    listing = fs.find(path, detail=True) or {path: fs.info(path)}
+    return _read_valu1_luts(parquet_table,
+                            json.dumps(storage_options, sort_keys=True),
+                            json.dumps(listing, sort_keys=True, default=str))
+
+
+@lru_cache(maxsize=2)
+def _read_valu1_luts(parquet_table, storage_options_json, listing_json):
+    """Read the valu1 table and build its lookup arrays. The arguments are
+    JSON strings so they can be hashed; the listing is only part of the key.
+    """
+    logger.info("reading parquet table")
+    storage_options = json.loads(storage_options_json) or {}
+    fs, path = fsspec.core.url_to_fs(parquet_table, **storage_options)
+    valu1 = pyarrow.dataset.dataset(path,
+                                    filesystem=fs,
+                                    format='parquet',
+                                    partitioning='hive')
+    return _build_luts(valu1)
+
+
+# valu1 lookup arrays used by _derived_rasters_for_tile; in worker processes
+# these are views onto shared memory blocks owned by the parent
+_luts = None
+_lut_blocks: List[SharedMemory] = []
+
+
+def _share_luts(luts):
+    """Copy the lookup arrays into shared memory blocks.
+
+    Returns the blocks, which the caller must close and unlink, and a
+    picklable {column: (block name, shape, dtype)} description for workers.
+    """
+    blocks = []
+    specs = {}
+    for col, lut in luts.items():
+        block = SharedMemory(create=True, size=max(lut.nbytes, 1))
+        blocks.append(block)
+        np.ndarray(lut.shape, dtype=lut.dtype, buffer=block.buf)[:] = lut
+        specs[col] = (block.name, lut.shape, lut.dtype.str)
+    return blocks, specs
+
+
+def _init_derived_worker(lut_specs):
+    """Attach a worker process to the lookup arrays shared by the parent."""
+    global _luts
+    _luts = {}
+    for col, (name, shape, dtype) in lut_specs.items():
+        block = SharedMemory(name=name)
+        # keep the block open for as long as the arrays are in use
+        _lut_blocks.append(block)
+        _luts[col] = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+
+
+def _derived_rasters_for_tile(mukey_file, destination=None, luts=None):
+    """Create the derived COGs for a single mukey raster. Module level so that
+    it can be submitted to a process pool, in which case the lookup arrays
+    come from _init_derived_worker.
+    """
+    if luts is None:
+        luts = _luts
+    if '?' in mukey_file:
+        mf_tmp, _ = mukey_file.split('?', 1)
+    else:
+        mf_tmp = mukey_file
+    in_dir, file_name = os.path.split(mf_tmp)
+    logger.info("processing %s", file_name)
+
+    _, suffix = file_name.split("_", 1)
+    out_dir = destination if destination is not None else in_dir
+
+    with rasterio.open(mukey_file) as f:
+        profile = f.profile
+        profile.update(driver='COG')
+
+        mukey = f.read(1)
+    # mukeys index the row lookup directly; np.take's clip mode sends
+    # anything past the end (e.g. the raster nodata) to the trailing missing
+    # row slot, and there is no mukey 0, so slot 0 is missing too. Each column
+    # is then a gather from its (small) array of values
+    rows = np.take(luts['mukey'], mukey, mode='clip')
+    del mukey
+
+    # the output profile carries over from one column to the next, so settle
+    # each column's profile in order before writing them concurrently
+    columns = []
+    for col, lut in luts.items():
+        if col == 'mukey':
+            continue
+        if lut.dtype == np.int16:
+            profile.update(dtype=rasterio.int16,
+                           nodata=-9999,
+                           resampling='NEAREST')
+        else:
+            profile.update(dtype=rasterio.float32)
+            # fill the missing values in the (small) array of values, rather
+            # than in every tile-sized output
+            lut = np.where(np.isnan(lut), np.float32(profile['nodata']), lut)
+        columns.append((col, lut, dict(profile)))
+
+    # one output buffer per dtype and thread, reused by every column of that
+    # dtype the thread writes
+    scratch = threading.local()
+
+    def write_column(col, lut, profile):
+        logger.info("  starting %s", col)
+        out_file = os.path.join(out_dir, f"{col.replace('_', '-')}_{suffix}")
+
+        buffers = scratch.__dict__.setdefault('buffers', {})
+        d = buffers.get(lut.dtype)
+        if d is None:
+            d = buffers[lut.dtype] = np.empty(rows.shape, lut.dtype)
+        np.take(lut, rows, out=d)
+        if (d == profile['nodata']).all():
+            logger.info('no valid data -- skipping')
+            return None
+        with rasterio.open(out_file, 'w', **profile) as dst:
+            dst.write_band(1, d.astype(profile['dtype'], copy=False))
+            dst.set_band_description(1, VALU1_DESCRIPTIONS[col])
+        logger.info('    finishd %s', col)
+        return out_file
+
+    # GDAL releases the GIL while compressing and writing, so the next
+    # column's gather overlaps the previous column's write
+    with ThreadPoolExecutor(max_workers=COLUMN_WORKERS) as executor:
+        written = executor.map(lambda column: write_column(*column), columns)
+        return [out_file for out_file in written if out_file is not None]
+
+
 def create_derived_rasters(parquet_table,
                            mukey_files,
                            destination=None,
-                           parquet_storage_options=None):
-    logger.info("reading parquet table")
-    valu1 = pd.read_parquet(
-        parquet_table,
-        engine='pyarrow',
-        storage_options=parquet_storage_options).set_index('mukey')
+                           parquet_storage_options=None,
+                           workers=1):
+    luts = _load_valu1_luts(parquet_table, parquet_storage_options)
 
     cogs_produced = []
-    for mukey_file in mukey_files:
-        if '?' in mukey_file:
-            mf_tmp, _ = mukey_file.split('?', 1)
-        else:
-            mf_tmp = mukey_file
-        in_dir, file_name = os.path.split(mf_tmp)
-        logger.info("processing %s", file_name)
-
-        _, suffix = file_name.split("_", 1)
-        out_dir = destination if destination is not None else in_dir
-
-        with rasterio.open(mukey_file) as f:
-            profile = f.profile
-            profile.update(driver='COG')
-
-            mukey = f.read(1)
-            unique_mukeys, inverse = np.unique(mukey, return_inverse=True)
-            logger.info("  unique mukeys: %d", len(unique_mukeys))
-
-            for col in valu1.columns:
-                if col == 'mukey':
-                    continue
-                logger.info("  starting %s", col)
-                if valu1[col].dtype.name == 'Int16':
-                    valu1[col] = valu1[col].fillna(-9999).astype('int16')
-                    profile.update(dtype=rasterio.int16,
-                                   nodata=-9999,
-                                   resampling='NEAREST')
-                elif valu1[col].dtype.name == 'float32':
-                    profile.update(dtype=rasterio.float32)
-                else:
-                    raise TypeError('unsupported type')
-                out_file = os.path.join(out_dir,
-                                        f"{col.replace('_', '-')}_{suffix}")
-
-                d = (valu1[col].groupby(level=0).first().reindex(
-                    unique_mukeys,
-                    fill_value=profile['nodata']).to_numpy()[inverse].reshape(
-                        mukey.shape))
-                if valu1[col].dtype.name == 'float32':
-                    d = np.nan_to_num(d, nan=profile['nodata'])
-                if (d == profile['nodata']).all():
-                    logger.info('no valid data -- skipping')
-                    continue
-                with rasterio.open(out_file, 'w', **profile) as dst:
-                    dst.write_band(1, d.astype(profile['dtype']))
-                    dst.set_band_description(1, VALU1_DESCRIPTIONS[col])
-                logger.info('    finishd %s', col)
-                cogs_produced.append(out_file)
+    if workers > 1:
+        # each mukey file is independent, so process them in parallel; the
+        # lookup arrays go through shared memory rather than being copied
+        # into every worker
+        blocks, lut_specs = _share_luts(luts)
+        try:
+            with ProcessPoolExecutor(max_workers=workers,
+                                     initializer=_init_derived_worker,
+                                     initargs=(lut_specs, )) as executor:
+                # collect the results in the order of mukey_files, however
+                # the workers finish
+                for cogs in executor.map(
+                        partial(_derived_rasters_for_tile,
+                                destination=destination), mukey_files):
+                    cogs_produced.extend(cogs)
+        finally:
+            for block in blocks:
+                block.close()
+                block.unlink()
+    else:
+        for mukey_file in mukey_files:
+            cogs_produced.extend(
+                _derived_rasters_for_tile(mukey_file, destination, luts))
     return cogs_produced
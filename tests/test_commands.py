@@ -1,9 +1,81 @@
+import json
+import os
+from datetime import datetime
+from tempfile import TemporaryDirectory
+from unittest import mock
+
+import pystac
 from stactools.testing import CliTestCase
 
 from stactools.gnatsgo.commands import create_gnatsgo_command
 
 
+def _item(sources, validate=False):
+    """A stand-in for stac.create_item, named after its first source."""
+    item_id = os.path.splitext(os.path.basename(sources[0]))[0]
+    return pystac.Item(id=item_id,
+                       geometry=None,
+                       bbox=None,
+                       datetime=datetime(2020, 7, 1),
+                       properties={})
+
+
 class CommandsTest(CliTestCase):
 
     def create_subcommand_functions(self):
         return [create_gnatsgo_command]
+
+    def _write_manifest(self, tmp_dir, names):
+        manifest = os.path.join(tmp_dir, 'manifest.jsonl')
+        with open(manifest, 'w') as f:
+            for name in names:
+                destination = os.path.join(tmp_dir, f'{name}.json')
+                f.write(
+                    json.dumps({
+                        'destination': destination,
+                        'sources': [f'{name}.tif'],
+                    }) + '\n')
+        return manifest
+
+    def test_create_items(self):
+        with TemporaryDirectory() as tmp_dir:
+            names = ['mukey_a', 'mukey_b', 'mukey_c']
+            manifest = self._write_manifest(tmp_dir, names)
+            with mock.patch('stactools.gnatsgo.stac.create_item',
+                            side_effect=_item) as create_item:
+                result = self.run_command(
+                    ['gnatsgo', 'create-items', manifest, '--workers', '2'])
+            self.assertEqual(result.exit_code, 0, msg=result.output)
+
+            self.assertEqual(create_item.call_count, len(names))
+            for name in names:
+                create_item.assert_any_call([f'{name}.tif'], validate=False)
+                item = pystac.Item.from_file(
+                    os.path.join(tmp_dir, f'{name}.json'))
+                self.assertEqual(item.id, name)
+
+    def test_config(self):
+        with TemporaryDirectory() as tmp_dir:
+            manifest = self._write_manifest(tmp_dir, ['mukey_a'])
+            config = os.path.join(tmp_dir, 'config.json')
+            with open(config, 'w') as f:
+                json.dump({'create-items': {'validate': True}}, f)
+
+            # the config file sets the default
+            with mock.patch('stactools.gnatsgo.stac.create_item',
+                            side_effect=_item) as create_item:
+                result = self.run_command(
+                    ['gnatsgo', '--config', config, 'create-items', manifest])
+            self.assertEqual(result.exit_code, 0, msg=result.output)
+            create_item.assert_called_once_with(['mukey_a.tif'], validate=True)
+
+            # and the command line overrides it
+            with mock.patch('stactools.gnatsgo.stac.create_item',
+                            side_effect=_item) as create_item:
+                result = self.run_command([
+                    'gnatsgo', '--config', config, 'create-items', manifest,
+                    '--no-validate'
+                ])
+            self.assertEqual(result.exit_code, 0, msg=result.output)
+            create_item.assert_called_once_with(['mukey_a.tif'],
+                                                validate=False)
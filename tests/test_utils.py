@@ -0,0 +1,369 @@
+import os
+import re
+import unittest
+from tempfile import TemporaryDirectory
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+import pyarrow
+import pyarrow.dataset
+import pyarrow.parquet
+import rasterio
+from pandas import CategoricalDtype
+from rasterio.transform import from_origin
+
+from stactools.gnatsgo.constants import STATE_INDEX
+from stactools.gnatsgo.utils import (_LOGICAL_DTYPES, Table, _build_luts,
+                                     _load_valu1_luts, create_derived_rasters,
+                                     iter_gdb_layer)
+
+# newer pandas convert strings to large_string
+STRING = [pyarrow.string(), pyarrow.large_string()]
+
+
+def _table(astype, partition=False, description=None):
+    """A Table with the given column types, without reading any gdb."""
+    table = Table.__new__(Table)
+    table.table_name = 'test'
+    table.description = description
+    table.partition = partition
+    table.astype = dict(astype)
+    table.columns = {
+        col: {
+            'meta': {
+                'description': f'{col} column'
+            }
+        }
+        for col in astype
+    }
+    table.schema = None
+    if partition:
+        table.astype['state'] = CategoricalDtype(list(STATE_INDEX))
+    return table
+
+
+class SchemaTest(unittest.TestCase):
+
+    def test_logical_dtypes(self):
+        # name each column after its logical data type
+        schema = _table(_LOGICAL_DTYPES)._schema()
+        self.assertEqual(schema.names, list(_LOGICAL_DTYPES))
+        expected = {
+            'Boolean': [pyarrow.bool_()],
+            'Date/Time': [pyarrow.timestamp('ns')],
+            'String': STRING,
+            'Vtext': STRING,
+        }
+        self.assertEqual(set(expected), set(_LOGICAL_DTYPES))
+        for col, arrow_types in expected.items():
+            with self.subTest(col):
+                self.assertIn(schema.field(col).type, arrow_types)
+                self.assertEqual(
+                    schema.field(col).metadata,
+                    {b'description': f'{col} column'.encode()})
+
+    def test_inferred_dtypes(self):
+        schema = _table({
+            'a': 'Int16',
+            'b': 'Int32',
+            'c': 'float32',
+            'd': CategoricalDtype(['x', 'y']),
+        })._schema()
+        self.assertEqual(schema.field('a').type, pyarrow.int16())
+        self.assertEqual(schema.field('b').type, pyarrow.int32())
+        self.assertEqual(schema.field('c').type, pyarrow.float32())
+        self.assertIn(
+            schema.field('d').type,
+            [pyarrow.dictionary(pyarrow.int8(), t) for t in STRING])
+
+    def test_partition_and_description(self):
+        table = _table({'a': 'Int32'}, partition=True, description='desc')
+        schema = table._schema()
+        self.assertEqual(schema.names, ['a', 'state'])
+        self.assertIsNone(schema.field('state').metadata)
+        self.assertEqual(schema.metadata, {b'description': b'desc'})
+        # the schema is only built once
+        self.assertIs(table._schema(), schema)
+
+
+NODATA = 2147483647
+
+# mukey 4 is not in the table
+MUKEYS = np.array([[1, 2, 3, 4], [NODATA, 1, 2, 3], [4, 4, 1, 1]],
+                  dtype='int32')
+
+
+def _write_valu1(path):
+    """A valu1 table with an int16 and a float32 column, each missing the
+    value for mukey 2.
+    """
+    pyarrow.parquet.write_table(
+        pyarrow.table({
+            'mukey':
+            pyarrow.array([1, 2, 3], pyarrow.int32()),
+            'rootznemc':
+            pyarrow.array([10, None, 30], pyarrow.int16()),
+            'aws0_5':
+            pyarrow.array([0.5, None, 2.5], pyarrow.float32()),
+        }), path)
+
+
+def _write_mukeys(path, mukeys):
+    with rasterio.open(path,
+                       'w',
+                       driver='GTiff',
+                       width=mukeys.shape[1],
+                       height=mukeys.shape[0],
+                       count=1,
+                       dtype=mukeys.dtype,
+                       nodata=NODATA,
+                       crs='EPSG:5070',
+                       transform=from_origin(0, 30, 10, 10)) as dst:
+        dst.write(mukeys, 1)
+
+
+class DerivedRastersTest(unittest.TestCase):
+
+    def test_build_luts(self):
+        with TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'valu1.parquet')
+            _write_valu1(path)
+            luts = _build_luts(pyarrow.dataset.dataset(path))
+
+        # mukeys outside the table point at the trailing missing row
+        np.testing.assert_array_equal(luts['mukey'], [3, 0, 1, 2, 3])
+        np.testing.assert_array_equal(luts['rootznemc'],
+                                      [10, -9999, 30, -9999])
+        self.assertEqual(luts['rootznemc'].dtype, np.int16)
+        np.testing.assert_array_equal(luts['aws0_5'],
+                                      [0.5, np.nan, 2.5, np.nan])
+        self.assertEqual(luts['aws0_5'].dtype, np.float32)
+
+    def test_load_valu1_luts(self):
+        with TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'valu1.parquet')
+            _write_valu1(path)
+            luts = _load_valu1_luts(path)
+            # read once, then cached
+            self.assertIs(_load_valu1_luts(path), luts)
+
+            # but read again once the table is regenerated
+            pyarrow.parquet.write_table(
+                pyarrow.table({
+                    'mukey':
+                    pyarrow.array([1, 2], pyarrow.int32()),
+                    'rootznemc':
+                    pyarrow.array([11, 22], pyarrow.int16()),
+                }), path)
+            luts = _load_valu1_luts(path)
+            np.testing.assert_array_equal(luts['rootznemc'], [11, 22, -9999])
+            self.assertNotIn('aws0_5', luts)
+
+    def test_create_derived_rasters(self):
+        # the values of each column by mukey, and the output dtype; mukeys
+        # without a value come out as the output's nodata
+        expected = {
+            'rootznemc': ({
+                1: 10,
+                3: 30
+            }, 'int16'),
+            'aws0-5': ({
+                1: 0.5,
+                3: 2.5
+            }, 'float32'),
+        }
+        for workers in (1, 2):
+            with self.subTest(
+                    workers=workers), TemporaryDirectory() as tmp_dir:
+                valu1 = os.path.join(tmp_dir, 'valu1.parquet')
+                _write_valu1(valu1)
+                mukey_files = [
+                    os.path.join(tmp_dir, 'mukey_a.tif'),
+                    os.path.join(tmp_dir, 'mukey_b.tif')
+                ]
+                _write_mukeys(mukey_files[0], MUKEYS)
+                # none of these mukeys are in the table, so nothing is written
+                _write_mukeys(mukey_files[1], np.full_like(MUKEYS, 4))
+                out_dir = os.path.join(tmp_dir, 'out')
+                os.makedirs(out_dir)
+
+                cogs = create_derived_rasters(valu1,
+                                              mukey_files,
+                                              destination=out_dir,
+                                              workers=workers)
+
+                # in the order of mukey_files and then columns, however the
+                # workers finish
+                self.assertEqual(cogs, [
+                    os.path.join(out_dir, f'{col}_a.tif') for col in expected
+                ])
+                self.assertEqual(sorted(os.listdir(out_dir)),
+                                 sorted(f'{col}_a.tif' for col in expected))
+                for col, (values, dtype) in expected.items():
+                    with rasterio.open(os.path.join(out_dir,
+                                                    f'{col}_a.tif')) as f:
+                        self.assertEqual(f.dtypes[0], dtype)
+                        # missing float values are filled, not left as NaN
+                        self.assertFalse(np.isnan(f.nodata))
+                        want = np.array(
+                            [[values.get(mukey, f.nodata) for mukey in row]
+                             for row in MUKEYS.tolist()],
+                            dtype=dtype)
+                        np.testing.assert_array_equal(f.read(1), want)
+
+
+class FakePyogrio:
+    """Stands in for pyogrio, reading layers from dataframes keyed by GDB
+    path. features is what read_info reports, or the row count if None.
+    """
+
+    def __init__(self, layers, features=None):
+        self.layers = layers
+        self.features = features
+
+    def read_info(self, gdbfile, layer=None):
+        df = self.layers[gdbfile]
+        features = len(df) if self.features is None else self.features
+        return {'fields': np.array(df.columns), 'features': features}
+
+    def read_dataframe(self,
+                       gdbfile,
+                       layer=None,
+                       columns=None,
+                       read_geometry=True,
+                       skip_features=0,
+                       max_features=None,
+                       sql=None):
+        df = self.layers[gdbfile]
+        if sql is not None:
+            column = re.match(r'SELECT DISTINCT "(\w+)"', sql).group(1)
+            return df[[column]].drop_duplicates()
+        if columns is not None:
+            df = df[list(columns)]
+        stop = None if max_features is None else skip_features + max_features
+        return df.iloc[skip_features:stop].reset_index(drop=True)
+
+
+def _region(mukeys):
+    """A GDB table with an integer, a boolean and a categorical column, as
+    the GDBs store them.
+    """
+    # in reverse, so that sorting by mukey has something to do
+    mukeys = np.asarray(mukeys, dtype='int64')[::-1]
+    return pd.DataFrame({
+        'mukey':
+        mukeys,
+        'flag':
+        np.array(['Yes', 'No ', '1  ', '0  ', 'No', None],
+                 dtype=object)[mukeys % 6],
+        'kind':
+        np.array(['a', 'b', None], dtype=object)[mukeys % 3],
+    })
+
+
+class GdbToParquetTest(unittest.TestCase):
+
+    def test_iter_gdb_layer(self):
+        layers = {'a.gdb': _region(np.arange(25)), 'b.gdb': _region([])}
+        for features in (None, -1):
+            with self.subTest(features=features), mock.patch(
+                    'stactools.gnatsgo.utils.pyogrio',
+                    FakePyogrio(layers, features)):
+                chunks = list(iter_gdb_layer('a.gdb', 'tbl', chunk_size=10))
+                self.assertEqual([len(c) for c in chunks], [10, 10, 5])
+                pd.testing.assert_frame_equal(
+                    pd.concat(chunks, ignore_index=True), layers['a.gdb'])
+
+                chunks = list(iter_gdb_layer('a.gdb', 'tbl', chunk_size=5))
+                self.assertEqual(sum(len(c) for c in chunks), 25)
+
+                chunks = list(
+                    iter_gdb_layer('a.gdb',
+                                   'tbl',
+                                   ignore_fields=['flag'],
+                                   chunk_size=10))
+                self.assertEqual(list(chunks[0].columns), ['mukey', 'kind'])
+
+                # an empty layer still yields one (empty) chunk
+                chunks = list(iter_gdb_layer('b.gdb', 'tbl', chunk_size=10))
+                self.assertEqual([len(c) for c in chunks], [0])
+
+    def _concat(self, partition, out_dir):
+        layers = {'AK.gdb': _region(np.arange(25)), 'HI.gdb': _region([3, 7])}
+        table = _table(
+            {
+                'mukey': 'Int32',
+                'flag': 'boolean',
+                # categories are collected from the GDBs
+                'kind': 'category',
+            },
+            partition=partition,
+            description='desc')
+        table.table_name = 'tbl'
+        table.files = {'AK': 'AK.gdb', 'HI': 'HI.gdb'}
+        table.engine = 'pyogrio'
+        table.has_geom = False
+        # read each region in several chunks
+        with mock.patch('stactools.gnatsgo.utils.pyogrio',
+                        FakePyogrio(layers)), mock.patch(
+                            'stactools.gnatsgo.utils.GDB_READ_CHUNK_SIZE', 7):
+            table.concat_table(out_dir=out_dir)
+        return layers
+
+    def _check_columns(self, df, layers):
+        self.assertEqual(len(df), sum(len(layer) for layer in layers.values()))
+        self.assertEqual(str(df.mukey.dtype), 'int32')
+        self.assertEqual(sorted(df.mukey),
+                         sorted(np.concatenate([np.arange(25), [3, 7]])))
+        # the GDB strings become booleans, with the others missing
+        flags = [True, False, True, False, False, None]
+        self.assertEqual(df.flag.tolist(), [flags[m % 6] for m in df.mukey])
+        self.assertEqual(df.kind.dtype, CategoricalDtype(['a', 'b']))
+        self.assertEqual(df.kind.isna().sum(),
+                         sum(1 for m in df.mukey if m % 3 == 2))
+
+    def test_concat_table(self):
+        with TemporaryDirectory() as out_dir:
+            layers = self._concat(False, out_dir)
+            table_dir = os.path.join(out_dir, 'tbl.parquet')
+            self.assertEqual(sorted(os.listdir(table_dir)),
+                             ['_common_metadata', 'part.0.parquet'])
+            schema = pyarrow.parquet.read_schema(
+                os.path.join(table_dir, '_common_metadata'))
+            self.assertEqual(schema.names, ['mukey', 'flag', 'kind'])
+            self.assertEqual(schema.metadata, {b'description': b'desc'})
+
+            df = pyarrow.parquet.read_table(
+                os.path.join(table_dir, 'part.0.parquet')).to_pandas()
+            self._check_columns(df, layers)
+
+    def test_concat_table_partitioned(self):
+        with TemporaryDirectory() as out_dir:
+            layers = self._concat(True, out_dir)
+            table_dir = os.path.join(out_dir, 'tbl.parquet')
+            self.assertEqual(sorted(os.listdir(table_dir)),
+                             ['_common_metadata', 'state=AK', 'state=HI'])
+            for state in ('AK', 'HI'):
+                part_dir = os.path.join(table_dir, f'state={state}')
+                self.assertEqual(os.listdir(part_dir), ['part.0.parquet'])
+                # the state is in the path, not the file
+                part = pyarrow.parquet.read_table(
+                    os.path.join(part_dir, 'part.0.parquet'))
+                self.assertNotIn('state', part.schema.names)
+                self.assertEqual(len(part), len(layers[f'{state}.gdb']))
+                # each chunk is sorted by mukey before it is written
+                self.assertEqual(
+                    part.column('mukey').to_pylist()[:7],
+                    sorted(part.column('mukey').to_pylist()[:7]))
+
+            schema = pyarrow.parquet.read_schema(
+                os.path.join(table_dir, '_common_metadata'))
+            self.assertEqual(schema.names, ['mukey', 'flag', 'kind', 'state'])
+            dataset = pyarrow.dataset.dataset(table_dir,
+                                              format='parquet',
+                                              partitioning='hive')
+            df = dataset.to_table().to_pandas()
+            self._check_columns(df, layers)
+            self.assertEqual(df.state.value_counts()[['AK', 'HI']].tolist(),
+                             [25, 2])